@@ -24,6 +24,12 @@ options:
     - Supported types: all, interfaces, inventory, license, mac_address_table, routes, route_neighbors, vrfs
     default: all
 
+notes:
+- All show commands are issued over the task's persistent connection, so use
+  C(ansible_connection=network_cli) with ControlPersist and pipelining enabled
+  and avoid ProxyCommand; without a persistent connection every task pays a
+  full SSH session setup.
+
 author:
 - Tommy McNeela (@tmcneela5c)
 '''
@@ -146,158 +152,317 @@ ansible_facts:
 # from ansible.module_utils._text import to_native, to_text
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.cisco.ios.plugins.module_utils.network.ios.ios import run_commands
+from collections import defaultdict
+import functools
 import ipaddress
+import itertools
 import logging
+import re
 from typing import Dict, List
 
+# numba is optional; the integer-only helpers it decorates run fine as plain
+# Python, just slower on hosts parsing very large route tables
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(f=None, **kwargs):
+        if f is None:
+            return lambda g: g
+        return f
+
 ROUTE_TYPES = ('BGP', 'connected', 'OSPF', 'static')
 
+# route kinds reported in all caps; everything else is capitalized
+_UPPERCASE_KINDS = frozenset({'bgp', 'eigrp', 'isis', 'ospf'})
+
+# NX-OS names some route types differently on the command line
+_NXOS_ROUTE_ALIAS = {'connected': 'direct'}
+
+# per-OS license show commands
+_LICENSE_COMMANDS = {'IOS': 'show license all', 'NXOS': 'show license'}
+
+# All parsing patterns are compiled once here at module scope; new parsers
+# should add theirs to this block rather than compiling at the call site.
+
+# quick shape test for dotted-quad strings; _is_valid_v4 does the range check
+_V4_RE = re.compile(r'^(?:\d{1,3}\.){3}\d{1,3}$')
+
+# strips every delimiter Cisco uses in MAC addresses in one pass
+_MAC_STRIP = str.maketrans('', '', '.:- \t')
+
+# matches one dynamic entry line of 'show mac address-table dynamic': vlan, MAC, interface
+_MAC_LINE_RE = re.compile(r'^\*\s+(\d+)\s+(\S+)\s+\S+\s+\S+\s+\S+\s+\S+\s+(\S+)', re.MULTILINE)
+
+# RFC 1918 first octets plus the default route, used to filter route output on the device itself
+_RFC1918_FILTER = r'(10\.|172\.(1[6-9]|2[0-9]|3[01])\.|192\.168\.|0\.0\.0\.0)'
+
+# OSPF inter-area/external route designators that may precede the prefix
+_OSPF_KINDS = frozenset({'E1', 'E2', 'IA', 'N1', 'N2'})
+
+# full or wrapped IOS OSPF route line: optional designator, prefix, optional next hop + interface
+_OSPF_PREFIX_RE = re.compile(
+    r'^O[* ]\s*(?:(?:' + '|'.join(sorted(_OSPF_KINDS)) + r')\s+)*(\d+\.\d+\.\d+\.\d+(?:/\d+)?)'
+    r'(?:\s+\[[^\]]+\]\s+via\s+([^\s,]+),?.*?(\S+))?\s*$')
+
+# continuation line of a wrapped IOS OSPF entry: '[110/2] via 10.0.0.1, 1w2d, Gi0/1'
+_OSPF_VIA_RE = re.compile(r'^\s+\[[^\]]+\]\s+via\s+([^\s,]+),?.*?(\S+)\s*$')
+
+# one 'show vrf' entry line: name, default RD ('<not set>' is two tokens),
+# protocols, optional interface list; entry lines may be indented
+_VRF_LINE_RE = re.compile(r'^\s*(\S+)\s+(?:<not set>|\S+)\s+(\S+)(?:\s+(.*))?$')
+
+# per-VRF section delimiters in 'show ip route vrf *' / 'vrf all' output
+_IOS_VRF_TABLE_RE = re.compile(r'^Routing Table: (\S+)\s*$', re.MULTILINE)
+_NXOS_VRF_TABLE_RE = re.compile(r'^IP Route Table for VRF "([^"]+)"', re.MULTILINE)
+
+# header line that opens each per-interface section of 'show interface'
+_IFACE_HEADER_RE = re.compile(r'^(\S+) is ', re.MULTILINE)
+
+# splits an interface name into its letter prefix and numeric tail (i.e. Eth + 2/48)
+_IFACE_ABBREV_RE = re.compile(r'^([A-Za-z-]+)(.*)$')
+
+# operating system markers in the 'show version' banner, most specific first
+_DEVICE_TYPE_RE = re.compile(r'Nexus|NX-OS|IOS-XE|IOS')
+
+
+@njit(cache=True)
+def _is_private_u32(packed: int) -> bool:
+    """
+    Test a packed 32-bit IPv4 address against the three RFC 1918 ranges.
+    Pure integer math so numba can JIT-compile it when available.
+    @param packed: address packed into a single integer, network byte order
+    @return: True if the address is private
+    """
+    return ((packed & 0xFF000000) == 0x0A000000        # 10.0.0.0/8
+            or (packed & 0xFFF00000) == 0xAC100000     # 172.16.0.0/12
+            or (packed & 0xFFFF0000) == 0xC0A80000)    # 192.168.0.0/16
+
+
+@functools.lru_cache(maxsize=8192)
+def _is_private_packed(addr: str) -> bool:
+    """
+    Check whether an address string is a private (RFC 1918) IPv4 address.
+    Packs the octets into one integer and tests with mask compares, which is
+    far cheaper than building an IPv4Address. Memoized because route tables
+    repeat the same prefixes many times.
+    @param addr: dotted-quad address string (no prefix length)
+    @return: True if the address is private
+    """
+    a, b, c, d = map(int, addr.split('.', 3))
+    return _is_private_u32((a << 24) | (b << 16) | (c << 8) | d)
+
+
+@functools.lru_cache(maxsize=8192)
+def _is_valid_v4(addr: str) -> bool:
+    """
+    Check whether a string is a valid IPv4 address without raising.
+    @param addr: candidate address string
+    @return: True if the string is a valid IPv4 address
+    """
+    try:
+        ipaddress.IPv4Address(addr)
+        return True
+    except ValueError:
+        return False
+
 
+@functools.lru_cache(maxsize=65536)
 def format_mac_address(mac_address: str) -> str:
     """
     Format a MAC address of arbitrary format into colon-separated standard format.
+    Memoized because switch MAC tables repeat addresses across VLAN entries.
     @param mac_address: original MAC address to format
     @return: formatted MAC address
     """
-    try:
-        # remove delimiters and convert to lowercase
-        mac = mac_address.replace('.', '').replace(':', '').replace('-', '').lower()
-        # remove whitespaces
-        mac = ''.join(mac.split())
-        # MAC address must be alphanumeric and length 12
-        assert len(mac) == 12
-        assert mac.isalnum()
-        mac = ':'.join(mac[i:i + 2] for i in range(0, 12, 2))
-        return mac
-    except:
+    # remove delimiters and whitespace in one pass and convert to lowercase
+    mac = mac_address.translate(_MAC_STRIP).lower()
+    # MAC address must be alphanumeric and length 12
+    if len(mac) != 12 or not mac.isalnum():
         return mac_address
+    return f'{mac[0:2]}:{mac[2:4]}:{mac[4:6]}:{mac[6:8]}:{mac[8:10]}:{mac[10:12]}'
 
 
-def get_device_type(module: AnsibleModule) -> str:
+def _collect_route_commands(operating_system: str, vrfs: List, route_types) -> List[str]:
+    """
+    Build the full list of route table commands so they can be sent to the device in one batch.
+    @param operating_system: operating system to pull from
+    @param vrfs: list of VRF names (use None for the global routing table)
+    @param route_types: route types to query (i.e. BGP, OSPF, etc)
+    @return: list of show commands, ordered by VRF then route type
+    """
+    commands = []
+    is_nxos = operating_system.upper() == 'NXOS'
+    for vrf in vrfs:
+        for route_type in route_types:
+            rt_lower = route_type.lower()
+            if is_nxos:
+                rt = _NXOS_ROUTE_ALIAS.get(route_type, route_type)
+                if vrf:
+                    cmd = f'show ip route vrf {vrf} {rt.lower()}'
+                else:
+                    cmd = f'show ip route {rt.lower()}'
+                # the parser only looks at prefix ('ubest') and next-hop ('via') lines
+                cmd += ' | egrep "ubest|via"'
+            else:
+                if vrf:
+                    cmd = f'show ip route vrf {vrf} secondary {rt_lower}'
+                else:
+                    cmd = f'show ip route secondary {rt_lower}'
+                first_letter = route_type[0].upper()
+                if rt_lower == 'ospf':
+                    # keep 'via' continuation lines for the wrapped OSPF entry format
+                    cmd += f' | include ^{first_letter}[* ]|via'
+                elif rt_lower != 'connected':
+                    # discard public routes on the device; the Python is_private
+                    # check stays in place as a safety net
+                    cmd += f' | include ^{first_letter}[* ].*{_RFC1918_FILTER}'
+            commands.append(cmd)
+    return commands
+
+
+def _collect_all_vrf_route_commands(operating_system: str, route_types) -> List[str]:
     """
-    Get the type of device (operating system).
+    Build one all-VRFs route table command per route type. The device-side
+    filters keep the per-VRF header lines so the output can be split locally.
+    @param operating_system: operating system to pull from
+    @param route_types: route types to query (i.e. BGP, OSPF, etc)
+    @return: list of show commands, one per route type
+    """
+    commands = []
+    is_nxos = operating_system.upper() == 'NXOS'
+    for route_type in route_types:
+        rt_lower = route_type.lower()
+        if is_nxos:
+            rt = _NXOS_ROUTE_ALIAS.get(route_type, route_type)
+            commands.append(f'show ip route vrf all {rt.lower()} | egrep "VRF|ubest|via"')
+        else:
+            cmd = f'show ip route vrf * secondary {rt_lower}'
+            first_letter = route_type[0].upper()
+            if rt_lower == 'ospf':
+                cmd += f' | include ^Routing Table:|^{first_letter}[* ]|via'
+            elif rt_lower != 'connected':
+                cmd += f' | include ^Routing Table:|^{first_letter}[* ].*{_RFC1918_FILTER}'
+            commands.append(cmd)
+    return commands
+
+
+def _get_routes_all_vrfs(module: AnsibleModule, operating_system: str, route_types) -> Dict[str, Dict]:
+    """
+    Fetch the routes of every VRF with one command per route type and bucket
+    the parsed routes by VRF name.
     @param module: ansible module object
-    @return: device type (operating system)
+    @param operating_system: operating system to pull from
+    @param route_types: route types to query (i.e. BGP, OSPF, etc)
+    @return: dictionary of VRF name to route type to list of routes
     """
-    # TODO: show context, get interfaces for NX-OS
-    cmd = 'show inventory | include Chassis'
-    # rc, stdout, stderr = module.run_command(cmd, use_unsafe_shell=True)
-    stdout = run_commands(module, ['term len 0', cmd])
-    l1 = stdout[1].splitlines[0]
-    device_type = l1.split('"')[-2].strip()
-    return device_type
+    commands = _collect_all_vrf_route_commands(operating_system, route_types)
+    outputs = run_commands(module, commands)
+    table_re = _NXOS_VRF_TABLE_RE if operating_system == 'NXOS' else _IOS_VRF_TABLE_RE
+    routes_by_vrf = {}
+    # collect failures and warn once at the end instead of logging per section
+    errors = []
+    for route_type, output in zip(route_types, outputs):
+        headers = list(table_re.finditer(output))
+        for i, match in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(output)
+            section = output[match.end():end]
+            try:
+                parsed = parse_routes(operating_system, section.splitlines(), route_type)
+            except Exception as e:
+                errors.append((match.group(1), route_type, repr(e)))
+                continue
+            routes_by_vrf.setdefault(match.group(1), {})[route_type] = parsed
+    if errors:
+        module.warn(f'route lookup failures: {errors[:5]}{" ..." if len(errors) > 5 else ""}')
+    return routes_by_vrf
 
 
-def _get_routes_ios(module, route_type: str, vrf: str = None) -> List[Dict]:
+def _parse_routes_ios(lines: List[str], route_type: str) -> List[Dict]:
     """
-    Get IP route table from IOS device.
-    @param module: ansible module object
+    Parse IP route table output from an IOS device.
+    @param lines: output lines of the show ip route command
     @param route_type: type of route (i.e. BGP, OSPF, etc)
-    @param vrf: optional VRF name
     @return: list of routes
     """
     routes = []
-    if vrf:
-        cmd = f'show ip route vrf {vrf} secondary {route_type.lower()}'
-    else:
-        cmd = f'show ip route secondary {route_type.lower()}'
-    # rc, stdout, stderr = module.run_command(cmd, use_unsafe_shell=True)
-    # lines = stdout.splitlines()
-    stdout = run_commands(module, ['term len 0', cmd])
-    lines = stdout[1].splitlines()
-    if route_type.lower() != 'ospf':
+    rt_lower = route_type.lower()
+    if rt_lower != 'ospf':
+        # hoist everything that does not change per line out of the loop
         first_letter = route_type[0].upper()
+        prefixes = (f'{first_letter} ', f'{first_letter}*')
+        rt_kind = route_type.upper() if rt_lower in _UPPERCASE_KINDS else route_type.capitalize()
+        is_connected = rt_lower == 'connected'
         for line in lines:
-            if line.startswith(f'{first_letter} ') or line.startswith(f'{first_letter}*'):
+            if line.startswith(prefixes):
                 splitter = line.split()
                 # make sure we're only getting private routes and directly connected routes (otherwise we'll get a massive BGP table from edge routers)
-                addr_obj = ipaddress.IPv4Address(splitter[1].split('/')[0])
-                if addr_obj.is_private or splitter[1] == '0.0.0.0/0' or route_type.lower() == 'connected':
-                    route_details = {'route': splitter[1],
-                                     'kind': route_type.capitalize() if route_type.lower() not in ['bgp', 'eigrp',
-                                                                                                   'isis'] else route_type.upper()}
+                if is_connected or _is_private_packed(splitter[1].split('/')[0]) or splitter[1] == '0.0.0.0/0':
+                    route_details = {'route': splitter[1], 'kind': rt_kind}
                     if 'directly connected' in line:
                         route_details['next_hop'] = [{'address': None, 'interface': splitter[-1]}]
                     elif ' via ' in line:
                         route_details['next_hop'] = [{'address': splitter[4].replace(',', ''), 'interface': None}]
                     routes.append(route_details)
     else:
-        first_line = True
+        # single pass: full entries match directly, wrapped entries carry the
+        # prefix forward until their '[metric] via ...' continuation lines
+        keep_route = False
+        route = None
         for line in lines:
-            if line.startswith('O ') or line.startswith('O*'):
-                splitter = line.split()
-                if len(splitter) < 3:
-                    first_line = False
-                    route = splitter[1]
-                else:
-                    first_line = True
-                    r = 1
-                    n = 4
-                    route = splitter[r]
-                    next_hop_address = splitter[n]
-                    while route in ['E1', 'E2', 'IA', 'N1', 'N2']:
-                        r += 1
-                        n += 1
-                        route = splitter[r]
-                        next_hop_address = splitter[n]
-                    addr_obj = ipaddress.IPv4Address(route.split('/')[0])
-                    if addr_obj.is_private or route == '0.0.0.0/0':
-                        routes.append({'route': route, 'kind': 'OSPF',
-                                       'next_hop': [{'address': next_hop_address.replace(',', ''),
-                                                     'interface': splitter[-1]}]})
-            elif not first_line:
-                splitter = line.split()
-                # make sure this is a private route
-                addr_obj = ipaddress.IPv4Address(route.split('/')[0])
-                if addr_obj.is_private or route == '0.0.0.0/0':
+            match = _OSPF_PREFIX_RE.match(line)
+            if match:
+                route, next_hop_address, next_hop_interface = match.groups()
+                keep_route = _is_private_packed(route.split('/')[0]) or route == '0.0.0.0/0'
+                if keep_route and next_hop_address:
+                    routes.append({'route': route, 'kind': 'OSPF',
+                                   'next_hop': [{'address': next_hop_address,
+                                                 'interface': next_hop_interface}]})
+            elif keep_route and route:
+                match = _OSPF_VIA_RE.match(line)
+                if match:
                     routes.append({'route': route, 'kind': 'OSPF',
-                                   'next_hop': [{'address': splitter[2].replace(',', ''), 'interface': splitter[-1]}]})
+                                   'next_hop': [{'address': match.group(1), 'interface': match.group(2)}]})
     return routes
 
 
-def _get_routes_nxos(module: AnsibleModule, route_type: str, vrf: str = None) -> List[Dict]:
+def _parse_routes_nxos(lines: List[str], route_type: str) -> List[Dict]:
     """
-    Get IP route table from NX-OS device.
-    @param module: ansible module object
+    Parse IP route table output from an NX-OS device.
+    @param lines: output lines of the show ip route command
     @param route_type: type of route (i.e. BGP, OSPF, etc)
-    @param vrf: optional VRF name
     @return: list of routes
     """
     routes = []
-    route_type_aliases = {'connected': 'direct'}
-    rt = route_type
-    if route_type in route_type_aliases:
-        rt = route_type_aliases[route_type]
-    if vrf:
-        cmd = f'show ip route vrf {vrf} {rt.lower()} | begin ubest'
-    else:
-        cmd = f'show ip route {rt.lower()} | begin ubest'
-    stdout = run_commands(module, ['term len 0', cmd])
-    lines = stdout[1].splitlines()
     next_hops = []
     route_obj = None
+    # hoist everything that does not change per line out of the loop
+    rt_lower = route_type.lower()
+    rt_kind = route_type.upper() if rt_lower in _UPPERCASE_KINDS else route_type.capitalize()
+    is_connected = rt_lower == 'connected'
     for line in lines:
+        # split each line exactly once and skip blanks up front
+        splitter = line.replace(',', '').split()
+        if not splitter:
+            continue
         if 'ubest' in line:
             if route_obj:
                 route_obj['next_hop'] = next_hops
                 routes.append(route_obj)
             next_hops = []
-            route = line.split()[0].replace(',', '')
-            addr_obj = ipaddress.IPv4Address(route.split('/')[0])
-            if addr_obj.is_private or route == '0.0.0.0/0' or route_type.lower() == 'connected':
-                route_obj = {'route': route,
-                             'kind': route_type.capitalize() if route_type.lower() not in ['bgp', 'eigrp', 'isis',
-                                                                                           'ospf'] else route_type.upper()}
+            route_obj = None
+            route = splitter[0]
+            if is_connected or _is_private_packed(route.split('/')[0]) or route == '0.0.0.0/0':
+                route_obj = {'route': route, 'kind': rt_kind}
         elif 'via' in line:
             if route_obj:
-                splitter = line.replace(',', '').split()
                 next_hop_address = splitter[1].split('%')[0]
                 next_hop_interface = None
-                try:
-                    ipaddress.IPv4Address(next_hop_address)
-                    next_hop_interface = splitter[
-                        2] if route_type.lower() == 'connected' or route_type.lower() == 'ospf' else None
-                except:
+                if _is_valid_v4(next_hop_address):
+                    next_hop_interface = splitter[2] if rt_lower in ('connected', 'ospf') else None
+                else:
                     next_hop_interface = next_hop_address
                     next_hop_address = None
                 next_hops.append({'address': next_hop_address, 'interface': next_hop_interface})
@@ -307,71 +472,75 @@ def _get_routes_nxos(module: AnsibleModule, route_type: str, vrf: str = None) ->
     return routes
 
 
-def get_routes(module: AnsibleModule, operating_system: str, route_type: str, vrf: str = None) -> List[Dict]:
+# per-OS parser dispatch, resolved once per call by dict lookup
+_ROUTE_PARSERS = {'IOS': _parse_routes_ios, 'NXOS': _parse_routes_nxos}
+
+
+def parse_routes(operating_system: str, lines: List[str], route_type: str) -> List[Dict]:
     """
-    Get the route table.
-    @param module: ansible module object
-    @param operating_system: operating system to pull from
+    Parse a route table.
+    @param operating_system: operating system the output came from
+    @param lines: output lines of the show ip route command
     @param route_type: type of route (i.e. BGP, OSPF, etc)
-    @param vrf: optional VRF name
     @return: list of routes
     """
-    routes = []
-    if operating_system.upper() == 'IOS':
-        routes = _get_routes_ios(module, route_type, vrf)
-    elif operating_system.upper() == 'NXOS':
-        routes = _get_routes_nxos(module, route_type, vrf)
-    else:
+    parser = _ROUTE_PARSERS.get(operating_system)
+    if parser is None:
         logging.error(f'Unknown operating system')
-    return routes
+        return []
+    return parser(lines, route_type)
 
 
-def get_vrfs(module: AnsibleModule, operating_system: str) -> List[Dict]:
+def get_vrfs(module: AnsibleModule, operating_system: str, vrf_output: str = None) -> List[Dict]:
     """
     Get the list of VRFs and their routes and interfaces defined on this device.
     @param module: ansible module object
     @param operating_system: operating system to pull from
+    @param vrf_output: optional prefetched output of the show vrf command
     @return: list of VRFs and their routes and interfaces
     """
     vrfs = []
-    cmd = 'show vrf'
-    # rc, stdout, stderr = module.run_command(cmd, use_unsafe_shell=True)
-    stdout = run_commands(module, ['term len 0', cmd])
-    lines = stdout[1].splitlines()
+    if vrf_output is None:
+        stdout = run_commands(module, ['show vrf'])
+        vrf_output = stdout[0]
+    lines = vrf_output.splitlines()
     if len(lines) > 1:
-        for line in lines[1:]:
-            splitter = line.split()
-            vrf_name = splitter[0]
-            vrf_interfaces = None
-            if not splitter[-1].startswith('ipv'):
-                vrf_interfaces = splitter[-1].split(',')
-                if vrf_interfaces[0] == '--':
-                    vrf_interfaces = None
-            vrf_details = {'name': vrf_name, 'interfaces': vrf_interfaces}
-            routes = []
+        for line in itertools.islice(lines, 1, None):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            match = _VRF_LINE_RE.match(line)
+            if match:
+                vrf_name = match.group(1)
+                iface_field = (match.group(3) or '').strip()
+                vrf_interfaces = None
+                if iface_field and iface_field != '--' and not iface_field.startswith('ipv'):
+                    vrf_interfaces = iface_field.rstrip(',').split(',')
+                vrfs.append({'name': vrf_name, 'interfaces': vrf_interfaces, 'routes': []})
+            elif vrfs and vrfs[-1]['interfaces'] is not None and ' ' not in stripped:
+                # a lone interface token is the wrapped remainder of the
+                # previous entry's interface list; entries always have more columns
+                vrfs[-1]['interfaces'].extend(stripped.rstrip(',').split(','))
+    if vrfs:
+        # one all-VRFs scan per route type instead of one lookup per (VRF x type)
+        routes_by_vrf = _get_routes_all_vrfs(module, operating_system, ROUTE_TYPES)
+        for vrf_details in vrfs:
+            vrf_routes = routes_by_vrf.get(vrf_details['name'], {})
             for route_type in ROUTE_TYPES:
-                try:
-                    routes.extend(get_routes(module, operating_system, route_type, vrf_name))
-                except Exception as e:
-                    logging.warning(e)
-            vrf_details['routes'] = routes
-            vrfs.append(vrf_details)
+                vrf_details['routes'].extend(vrf_routes.get(route_type, []))
     return vrfs
 
 
-def get_route_neighbors(module: AnsibleModule) -> List[Dict]:
+def parse_route_neighbors(ospf_output: str, bgp_output: str) -> List[Dict]:
     """
-    Get the list of neighbors we are sharing routes with.
-    @param module: ansible module object
+    Parse the list of neighbors we are sharing routes with.
+    @param ospf_output: output of the show ip ospf neighbor command
+    @param bgp_output: output of the show ip bgp summary command
     @return: list of route neighbors
     """
     route_neighbors = []
-    # get OSPF neighbors
-    cmd = 'show ip ospf neighbor | begin Neighbor'
-    # rc, stdout, stderr = module.run_command(cmd, use_unsafe_shell=True)
-    # lines = stdout.splitlines()[2:]
-    stdout = run_commands(module, ['term len 0', cmd])
-    lines = stdout[1].splitlines()[1:]
+    # get OSPF neighbors; islice skips the header without copying the list
+    lines = itertools.islice(ospf_output.splitlines(), 1, None)
     for line in lines:
         line = line.replace(' -', '')
         splitter = line.split()
@@ -380,59 +549,38 @@ def get_route_neighbors(module: AnsibleModule) -> List[Dict]:
             {'neighbor_address': neighbor_address, 'routing_protocol': 'OSPF', 'neighbor_id': neighbor_id,
              'connection_state': connection_state, 'connected_interface': connected_interface, 'priority': priority})
     # get BGP neighbors
-    cmd = 'show ip bgp summary | begin Neighbor'
-    # rc, stdout, stderr = module.run_command(cmd, use_unsafe_shell=True)
-    # lines = stdout.splitlines()[2:]
-    stdout = run_commands(module, ['term len 0', cmd])
-    lines = stdout[1].splitlines()[1:]
-    # lines = stdout[2:]
+    lines = itertools.islice(bgp_output.splitlines(), 1, None)
     for line in lines:
         splitter = line.split()
-        try:
-            ipaddress.IPv4Address(splitter[0])
-        except:
+        if not splitter or not _V4_RE.match(splitter[0]) or not _is_valid_v4(splitter[0]):
             continue
         route_neighbors.append(
             {'neighbor_address': splitter[0], 'routing_protocol': 'BGP', 'neighbor_as_num': splitter[2]})
     return route_neighbors
 
 
-def get_mac_address_table(module: AnsibleModule) -> List[Dict]:
+def parse_mac_address_table(output: str) -> List[Dict]:
     """
-    Get the MAC address table from this switch.
-    @param module: ansible module object
+    Parse the MAC address table from this switch.
+    @param output: output of the show mac address-table command
     @return:
     """
-    mac_address_table = {}
-    cmd = 'show mac address-table dynamic'
-    # rc, stdout, stderr = module.run_command(cmd, use_unsafe_shell=True)
-    # lines = stdout.splitlines()
-    stdout = run_commands(module, ['term len 0', cmd], check_rc=False)
-    lines = stdout[1].splitlines()
-    for line in lines:
-        if line.startswith('* '):
-            splitter = line.split()
-            vlan = splitter[1]
-            mac_address = format_mac_address(splitter[2])
-            interface = splitter[7]
-            if interface not in mac_address_table:
-                mac_address_table[interface] = []
-            mac_address_table[interface].append({'mac_address': mac_address, 'vlan_id': vlan})
-    mac_address_table_list = []
-    for k, v in mac_address_table.items():
-        mac_address_table_list.append({'interface': k, 'mac_addresses': v})
-    return mac_address_table_list if len(mac_address_table_list) > 0 else None
-
-
-def get_inventory(module: AnsibleModule) -> List[Dict]:
-    """
-    Get the hardware inventory from this device.
-    @param module: ansible module object
+    mac_address_table = defaultdict(list)
+    for match in _MAC_LINE_RE.finditer(output):
+        vlan = match.group(1)
+        mac_address = format_mac_address(match.group(2))
+        mac_address_table[match.group(3)].append({'mac_address': mac_address, 'vlan_id': vlan})
+    return [{'interface': k, 'mac_addresses': v} for k, v in mac_address_table.items()] or None
+
+
+def parse_inventory(output: str) -> List[Dict]:
+    """
+    Parse the hardware inventory from this device.
+    @param output: output of the show inventory command
     @return: list of hardware inventory
     """
     inventory = []
-    stdout = run_commands(module, ['term len 0', 'show inventory'])
-    lines = stdout[1].splitlines()
+    lines = output.splitlines()
     for line in lines:
         if line.startswith('NAME:'):
             splitter = line.split('"')
@@ -450,15 +598,50 @@ def get_inventory(module: AnsibleModule) -> List[Dict]:
     return inventory
 
 
-def _get_interfaces_nxos(module: AnsibleModule) -> Dict[str, Dict]:
+def _split_interface_blocks(output: str) -> Dict[str, str]:
     """
-    Get details of interfaces assigned to this host.
-    @param module: ansible module object
+    Split the output of 'show interface' into per-interface sections.
+    @param output: full output of the show interface command
+    @return: dictionary of interface name to its section of the output
+    """
+    blocks = {}
+    headers = list(_IFACE_HEADER_RE.finditer(output))
+    for i, match in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(output)
+        blocks[match.group(1)] = output[match.start():end]
+    return blocks
+
+
+def _lookup_interface_block(blocks: Dict[str, str], iface_name: str) -> str:
+    """
+    Find the 'show interface' section for an interface, tolerating the
+    abbreviated names used by 'show ip interface brief' (i.e. Eth2/48).
+    @param blocks: dictionary of interface name to section text
+    @param iface_name: full or abbreviated interface name
+    @return: section text, or None if the interface was not found
+    """
+    block = blocks.get(iface_name)
+    if block is not None:
+        return block
+    match = _IFACE_ABBREV_RE.match(iface_name)
+    if match:
+        prefix, tail = match.groups()
+        for name, candidate in blocks.items():
+            if name.lower().startswith(prefix.lower()) and name.endswith(tail):
+                return candidate
+    return None
+
+
+def parse_interfaces_nxos(brief_output: str, detail_output: str) -> Dict[str, Dict]:
+    """
+    Parse details of interfaces assigned to this host.
+    @param brief_output: output of the show ip interface brief command
+    @param detail_output: output of the show interface command
     @return: dictionary of interfaces found on this host
     """
     interfaces = {}
-    stdout = run_commands(module, ['term len 0', 'show ip interf br oper vrf all'])
-    lines = stdout[1].splitlines()
+    lines = brief_output.splitlines()
+    detail_blocks = _split_interface_blocks(detail_output)
     for line in lines:
         splitter = line.split()
         if len(splitter) == 3:
@@ -466,8 +649,10 @@ def _get_interfaces_nxos(module: AnsibleModule) -> Dict[str, Dict]:
             iface_status = splitter[-1].split('/')
             iface_lineprotocol = iface_status[0].split('-')[-1]
             iface_operstatus = iface_status[1].split('-')[-1]
-            stdout2 = run_commands(module, ['term len 0', f'show interf {iface_name}'])
-            lines2 = stdout2[1].splitlines()
+            block = _lookup_interface_block(detail_blocks, iface_name)
+            if block is None:
+                continue
+            lines2 = block.splitlines()
             iface_name = lines2[0].split()[0]
             iface_mtu = None
             iface_subnet_mask = None
@@ -515,58 +700,6 @@ def _get_interfaces_nxos(module: AnsibleModule) -> Dict[str, Dict]:
     return interfaces
 
 
-def get_interfaces(module: AnsibleModule, operating_system: str) -> Dict[str, Dict]:
-    """
-    Get details of interfaces assigned to this host.
-    @param module: ansible module object
-    @param operating_system: operating system running on this host (i.e. IOS, NX-OS)
-    @return: dictionary of interfaces found on this host
-    """
-    interfaces = None
-    if operating_system.upper() == 'NXOS':
-        interfaces = _get_interfaces_nxos(module)
-    return interfaces
-
-
-def _get_license_ios(module: AnsibleModule) -> str:
-    """
-    Get license information.
-    @param module: ansible module object
-    @return: license information
-    """
-    stdout = run_commands(module, ['term len 0', 'show license all'])
-    software_license = stdout[1]
-    return software_license
-
-
-def _get_license_nxos(module: AnsibleModule) -> str:
-    """
-    Get license information.
-    @param module: ansible module object
-    @return: license information
-    """
-    stdout = run_commands(module, ['term len 0', 'show license'])
-    software_license = stdout[1]
-    return software_license
-
-
-def get_license(module: AnsibleModule, operating_system: str) -> str:
-    """
-    Get license information.
-    @param module: ansible module object
-    @param operating_system: operating system running on this device (i.e. IOS, NX-OS, etc)
-    @return: license information
-    """
-    software_license = None
-    if operating_system.upper() == 'IOS':
-        software_license = _get_license_ios(module)
-    elif operating_system.upper() == 'NXOS':
-        software_license = _get_license_nxos(module)
-    else:
-        logging.error(f'Unknown operating system')
-    return software_license
-
-
 def run_module():
     # define available arguments/parameters a user can pass to the module
     module_args = dict(fact_type=dict(type='str', required=False))
@@ -604,17 +737,23 @@ def run_module():
     if module.check_mode:
         module.exit_json(**result)
 
+    # everything below assumes a persistent connection; without one each task
+    # pays a full SSH session setup before the first command
+    if not getattr(module, '_socket_path', None):
+        module.warn('no persistent connection socket found; use '
+                    'ansible_connection=network_cli with ControlPersist and pipelining enabled')
+
     # manipulate or modify the state as needed (this is going to be the
     # part where your module will do what it needs to do)
     # rc, stdout, stderr = module.run_command('term len 0', use_unsafe_shell=True)
     # rc, stdout, stderr = module.run_command('show version', use_unsafe_shell=True)
     # determine operating system (default to IOS)
     operating_system = 'IOS'
-    output = run_commands(module, ['term len 0', 'show version'])
-    lines = output[1].splitlines()
-    if 'IOS' in lines[0]:
-        operating_system = 'IOS'
-    elif 'NX-OS' in lines[0] or 'Nexus' in lines[0]:
+    # disable paging once for the whole session instead of per command
+    output = run_commands(module, ['terminal length 0', 'show version'])
+    # only scan the start of the banner; 'show version' output can be large
+    match = _DEVICE_TYPE_RE.search(output[1][:4096])
+    if match and match.group(0) in ('Nexus', 'NX-OS'):
         operating_system = 'NXOS'
     # start gathering results
     result['ansible_facts'] = {
@@ -626,42 +765,79 @@ def run_module():
         'ansible_net_vrfs': None
     }
     fact_type = params['fact_type']
-    if fact_type == 'interfaces' or (fact_type == 'all' and operating_system == 'NXOS'):
-        result['ansible_facts']['ansible_net_interfaces'] = get_interfaces(module, operating_system)
-    if fact_type == 'inventory' or fact_type == 'all':
-        result['ansible_facts']['ansible_net_inventory'] = get_inventory(module)
-    if fact_type == 'license' or fact_type == 'all':
-        result['ansible_facts']['ansible_net_license'] = get_license(module, operating_system)
-    if fact_type == 'mac_address_table' or fact_type == 'all':
+    # queue every independent show command for the requested facts so they all
+    # go to the device in a single batch, then dispatch the outputs by index
+    commands = []
+    indexes = {}
+    if fact_type in ('interfaces', 'all') and operating_system == 'NXOS':
+        indexes['interfaces'] = len(commands)
+        commands.append('show ip interf br oper vrf all')
+        commands.append('show interface')
+    elif fact_type == 'interfaces':
+        result['ansible_facts']['ansible_net_interfaces'] = None
+    if fact_type in ('inventory', 'all'):
+        indexes['inventory'] = len(commands)
+        commands.append('show inventory')
+    if fact_type in ('license', 'all'):
+        indexes['license'] = len(commands)
+        commands.append(_LICENSE_COMMANDS.get(operating_system, 'show license all'))
+    if fact_type in ('mac_address_table', 'all'):
+        indexes['mac_address_table'] = len(commands)
+        commands.append('show mac address-table dynamic')
+    if fact_type in ('routes', 'all'):
+        indexes['routes'] = len(commands)
+        commands.extend(_collect_route_commands(operating_system, [None], ROUTE_TYPES))
+    if fact_type in ('route_neighbors', 'all'):
+        indexes['route_neighbors'] = len(commands)
+        commands.append('show ip ospf neighbor | begin Neighbor')
+        commands.append('show ip bgp summary | begin Neighbor')
+    if fact_type in ('vrfs', 'all'):
+        indexes['vrfs'] = len(commands)
+        commands.append('show vrf')
+    outputs = run_commands(module, commands, check_rc=False) if commands else []
+    if 'interfaces' in indexes:
+        result['ansible_facts']['ansible_net_interfaces'] = parse_interfaces_nxos(
+            outputs[indexes['interfaces']], outputs[indexes['interfaces'] + 1])
+    if 'inventory' in indexes:
+        result['ansible_facts']['ansible_net_inventory'] = parse_inventory(outputs[indexes['inventory']])
+    if 'license' in indexes:
+        result['ansible_facts']['ansible_net_license'] = outputs[indexes['license']]
+    if 'mac_address_table' in indexes:
         # get MAC address table
         mac_address_table = None
         try:
-            mac_address_table = get_mac_address_table(module)
+            mac_address_table = parse_mac_address_table(outputs[indexes['mac_address_table']])
         except Exception as e:
             logging.warning(e)
         result['ansible_facts']['ansible_net_mac_address_table'] = mac_address_table
-    if fact_type == 'routes' or fact_type == 'all':
-        # get L3 routes
+    if 'routes' in indexes:
+        # get L3 routes, saving any parse failures for a single warning
         routes = []
-        for route_type in ROUTE_TYPES:
+        errors = []
+        start = indexes['routes']
+        for offset, route_type in enumerate(ROUTE_TYPES):
             try:
-                routes.extend(get_routes(module, operating_system, route_type))
+                routes.extend(parse_routes(operating_system, outputs[start + offset].splitlines(), route_type))
             except Exception as e:
-                logging.warning(e)
+                errors.append((route_type, repr(e)))
+        if errors:
+            module.warn(f'route parse failures: {errors}')
         if len(routes) == 0:
             routes = None
         result['ansible_facts']['ansible_net_routes'] = routes
-    if fact_type == 'route_neighbors' or fact_type == 'all':
+    if 'route_neighbors' in indexes:
         # get route neighbors info
         route_neighbors = None
         try:
-            route_neighbors = get_route_neighbors(module)
+            route_neighbors = parse_route_neighbors(outputs[indexes['route_neighbors']],
+                                                    outputs[indexes['route_neighbors'] + 1])
         except Exception as e:
             logging.warning(e)
         result['ansible_facts']['ansible_net_route_neighbors'] = route_neighbors
-    if fact_type == 'vrfs' or fact_type == 'all':
+    if 'vrfs' in indexes:
         # get VRF info
-        result['ansible_facts']['ansible_net_vrfs'] = get_vrfs(module, operating_system)
+        result['ansible_facts']['ansible_net_vrfs'] = get_vrfs(module, operating_system,
+                                                               outputs[indexes['vrfs']])
     # in the event of a successful module execution, you will want to
     # simple AnsibleModule.exit_json(), passing the key/value results
     module.exit_json(**result)